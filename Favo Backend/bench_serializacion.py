@@ -0,0 +1,112 @@
+"""Costo por fila de serializar listas: camino de FastAPI vs SalidaJSON.
+
+Uso: python bench_serializacion.py [filas] [repeticiones]
+
+"antes" es lo que hace FastAPI con un response_model (validar + jsonable_encoder
++ JSONResponse) o sin él (jsonable_encoder + JSONResponse); "después" es
+SalidaJSON.responder(), con y sin VALIDAR_RESPUESTAS.
+"""
+import asyncio
+import hashlib
+import sys
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+import main
+
+FILAS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+REPETICIONES = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+loop = asyncio.new_event_loop()
+
+
+def filas_pedidos(n: int) -> list:
+    # Lo que devuelve PostgREST para /users/me/pedidos, con el JOIN a Categoria
+    return [{
+        "id_pedidos": i,
+        "titulo": f"Pedido {i}",
+        "descripcion": "Arreglar la pérdida de agua del baño " * 4,
+        "precio": 15000.5,
+        "id_usuario": 7,
+        "id_categoria": 3,
+        "status": "en_proceso",
+        "accepted_by": 9,
+        "accepted_at": "2026-10-18T12:00:00.123456",
+        "completado_at": None,
+        "modificado_at": "2026-10-18T12:00:00.123456+00:00",
+        "Categoria": {"nombre": "Plomería"},
+        "categoria_nombre": "Plomería",
+        "aceptado_por_nombre": "Ana",
+    } for i in range(n)]
+
+
+def filas_pedidos_publicos(n: int) -> list:
+    # /pedidos: sin response_model, con el Usuario embebido
+    return [{
+        "id_pedidos": i,
+        "titulo": f"Pedido {i}",
+        "descripcion": "Pintar un ambiente de 4x4 " * 4,
+        "precio": 30000,
+        "id_usuario": 7,
+        "id_categoria": 2,
+        "status": "pendiente",
+        "accepted_by": None,
+        "accepted_at": None,
+        "Usuario": {"id_usuario": 7, "nombre": "Juan"},
+    } for i in range(n)]
+
+
+def filas_usuarios(n: int) -> list:
+    # /usuarios/buscar: la foto viaja como URL (url_foto), no como base64 en la fila
+    return [{
+        "id_usuario": i,
+        "nombre": f"Usuario {i}",
+        "descripcion": "Electricista matriculado, presupuestos sin cargo",
+        "foto_perfil": main.url_foto({"id_usuario": i, "foto_hash": hashlib.sha256(str(i).encode()).hexdigest()}),
+        "verificado": True,
+    } for i in range(n)]
+
+
+def medir(nombre: str, funcion) -> float:
+    funcion()
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    por_fila = (time.perf_counter() - inicio) / (REPETICIONES * FILAS) * 1e6
+    print(f"  {nombre:<34} {por_fila:8.2f} µs/fila")
+    return por_fila
+
+
+def antes(filas: list, modelo=None):
+    campo = create_model_field("Response", List[modelo], mode="serialization") if modelo else None
+
+    def serializar():
+        contenido = loop.run_until_complete(serialize_response(field=campo, response_content=filas))
+        return JSONResponse(content=contenido).body
+    return serializar
+
+
+def despues(filas: list, salida: main.SalidaJSON, validar: bool = False):
+    def serializar():
+        main.VALIDAR_RESPUESTAS = validar
+        return salida.responder(filas).body
+    return serializar
+
+
+def comparar(titulo: str, filas: list, salida: main.SalidaJSON, modelo=None):
+    print(f"{titulo} ({FILAS} filas x {REPETICIONES})")
+    base = medir("antes (FastAPI)", antes(filas, modelo))
+    if modelo is not None:
+        validando = medir("después, VALIDAR_RESPUESTAS=1", despues(filas, salida, True))
+        print(f"  {'':<34} {base / validando:8.1f}x")
+    rapido = medir("después", despues(filas, salida))
+    print(f"  {'':<34} {base / rapido:8.1f}x")
+
+
+if __name__ == "__main__":
+    comparar("/users/me/pedidos", filas_pedidos(FILAS), main.salida_pedidos, main.Pedido)
+    comparar("/pedidos", filas_pedidos_publicos(FILAS), main.salida_filas)
+    comparar("/usuarios/buscar", filas_usuarios(FILAS), main.salida_usuarios_publicos, main.UsuarioPublico)
@@ -1,6 +1,8 @@
 import { useNavigate } from 'react-router-dom';
 import { StarIcon, CheckCircleIcon, MapPinIcon, BriefcaseIcon, ShoppingBagIcon } from 'lucide-react';
 
+const API_URL = "https://favo-iy6h.onrender.com";
+
 interface Usuario {
   id_usuario: number;
   nombre?: string;
@@ -32,7 +34,7 @@ export const ProfileCard = ({ usuario, rating }: { usuario: Usuario; rating?: {
       <div className="p-5 flex flex-col h-full">
         <div className="flex items-start space-x-4 mb-4">
           <img 
-            src={usuario.foto_perfil || `https://ui-avatars.com/api/?name=${encodeURIComponent(usuario.nombre || 'Usuario')}&background=fff&color=1f2937`}
+            src={usuario.foto_perfil ? `${API_URL}${usuario.foto_perfil}` : `https://ui-avatars.com/api/?name=${encodeURIComponent(usuario.nombre || 'Usuario')}&background=fff&color=1f2937`}
             alt={usuario.nombre} 
             className="w-16 h-16 rounded-full object-cover border-2 border-white shadow-sm flex-shrink-0" 
           />
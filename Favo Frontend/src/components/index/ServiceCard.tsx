@@ -2,6 +2,8 @@ import React from 'react';
 import { StarIcon, UserIcon, DollarSignIcon } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
 
+const API_URL = "https://favo-iy6h.onrender.com";
+
 type Servicio = {
   id_servicio: number;
   titulo: string;
@@ -35,7 +37,7 @@ export const ServiceCard = ({ provider, onContratar }: { provider: Servicio; onC
         <div className="flex items-start space-x-4 mb-3">
           {provider.foto_perfil ? (
             <img
-              src={`data:image/png;base64,${provider.foto_perfil}`}
+              src={`${API_URL}${provider.foto_perfil}`}
               alt={provider.titulo}
               className="w-16 h-16 rounded-full object-cover flex-shrink-0 border-2 border-white shadow-sm"
             />
@@ -4,6 +4,7 @@ import { NotificacionesModal } from './NotificacionesModal';
 import { NotificacionesRespuestasModal } from './NotificacionesRespuestasModal';
 import { Link, useLocation } from 'react-router-dom';
 import { Spinner } from './Spinner';
+import { useEventos } from '../../hooks/useEventos';
 
 
 export const Header = ({ isLoading = false }) => {
@@ -13,7 +14,7 @@ export const Header = ({ isLoading = false }) => {
   const [showNotificaciones, setShowNotificaciones] = useState(false);
   const [showNotificacionesRespuestas, setShowNotificacionesRespuestas] = useState(false);
   const [notificaciones, setNotificaciones] = useState<any[]>([]);
-  const [notificacionesRespuestas, setNotificacionesRespuestas] = useState<any[]>([]);
+  const [noLeidas, setNoLeidas] = useState({ servicios: 0, pedidos: 0, respuestas: 0 });
 
   const API_URL = 'https://favo-iy6h.onrender.com';
 
@@ -66,6 +67,32 @@ export const Header = ({ isLoading = false }) => {
     };
   }, []);
 
+  // Badges: contadores de no leídas, se refrescan cuando llega un evento de notificación
+  const fetchNoLeidas = () => {
+    const token = localStorage.getItem('access_token') || sessionStorage.getItem('access_token');
+    if (!token) return;
+    fetch(`${API_URL}/notificaciones/unread-count`, {
+      headers: {
+        'Authorization': `Bearer ${token}`
+      }
+    })
+      .then(res => res.ok ? res.json() : null)
+      .then(data => { if (data) setNoLeidas(data); })
+      .catch(() => {});
+  };
+
+  useEffect(() => {
+    if (user) fetchNoLeidas();
+  }, [user]);
+
+  // Una sola conexión por sesión: abrir o cerrar los modales no la reabre
+  useEventos(!!user, {
+    notificacion_servicio: fetchNoLeidas,
+    notificacion_pedido: fetchNoLeidas,
+    notificacion_respuesta: fetchNoLeidas,
+    resync: fetchNoLeidas
+  });
+
   // Fetch notificaciones solo cuando el modal se abre
   useEffect(() => {
     if (showNotificaciones && user) {
@@ -129,8 +156,8 @@ export const Header = ({ isLoading = false }) => {
               onClick={() => setShowNotificaciones(true)}
             >
               <BellIcon size={22} />
-              {notificaciones.length > 0 && (
-                <span className="absolute -top-1 -right-1 bg-red-500 text-white text-xs rounded-full px-1.5 py-0.5">{notificaciones.length}</span>
+              {noLeidas.servicios + noLeidas.pedidos > 0 && (
+                <span className="absolute -top-1 -right-1 bg-red-500 text-white text-xs rounded-full px-1.5 py-0.5">{noLeidas.servicios + noLeidas.pedidos}</span>
               )}
             </button>
 
@@ -141,8 +168,8 @@ export const Header = ({ isLoading = false }) => {
               onClick={() => setShowNotificacionesRespuestas(true)}
             >
               <CheckCircleIcon size={22} />
-              {notificacionesRespuestas.length > 0 && (
-                <span className="absolute -top-1 -right-1 bg-green-500 text-white text-xs rounded-full px-1.5 py-0.5">{notificacionesRespuestas.length}</span>
+              {noLeidas.respuestas > 0 && (
+                <span className="absolute -top-1 -right-1 bg-green-500 text-white text-xs rounded-full px-1.5 py-0.5">{noLeidas.respuestas}</span>
               )}
             </button>
 
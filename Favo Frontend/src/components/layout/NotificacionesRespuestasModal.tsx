@@ -281,16 +281,17 @@ export const NotificacionesRespuestasModal: React.FC<ModalProps> = ({ onClose })
       const data = await res.json();
       setNotificaciones(Array.isArray(data) ? data : []);
 
-      // Marcar como visto
-      if (Array.isArray(data)) {
-        data.forEach(notif => {
-          if (!notif.visto) {
-            fetch(`${API_BASE}/notificaciones_respuestas/${notif.id}/visto`, {
-              method: "PUT",
-              headers: { "Authorization": `Bearer ${token}` }
-            }).catch(e => console.error("Error marcando visto:", e));
-          }
-        });
+      // Marcar como visto (una sola llamada para todas las no vistas)
+      const noVistas = Array.isArray(data) ? data.filter(notif => !notif.visto).map(notif => notif.id) : [];
+      if (noVistas.length > 0) {
+        fetch(`${API_BASE}/notificaciones_respuestas/visto`, {
+          method: "PUT",
+          headers: {
+            "Authorization": `Bearer ${token}`,
+            "Content-Type": "application/json"
+          },
+          body: JSON.stringify({ ids: noVistas })
+        }).catch(e => console.error("Error marcando visto:", e));
       }
     } catch (err) {
       setError("Error de conexión");
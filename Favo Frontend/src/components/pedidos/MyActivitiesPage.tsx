@@ -1,7 +1,8 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import { ActivityTabs } from './ActivityTabs';
 import { PedidoCard } from './PedidoCard';
 import { ServicioCard } from './ServicioCard';
+import { useEventos } from '../../hooks/useEventos';
 
 type Pedido = {
   id_pedidos: number;
@@ -39,6 +40,13 @@ export default function MyActivitiesPage() {
   const [servicios, setServicios] = useState<Servicio[]>([]);
   const [loading, setLoading] = useState(false);
 
+  // La conexión SSE se abre una vez; siempre recarga con los filtros actuales
+  const fetchDataRef = useRef<() => void>(() => {});
+  useEventos(true, {
+    pedido: () => fetchDataRef.current(),
+    resync: () => fetchDataRef.current()
+  });
+
   const headers = useMemo(() => ({
     Authorization: `Bearer ${getToken()}`,
     'Content-Type': 'application/json'
@@ -81,11 +89,15 @@ export default function MyActivitiesPage() {
       }
     }
     fetchData();
-    
-    // Refresco automático cada 5 segundos para mantener datos actualizados
-    const interval = setInterval(fetchData, 5000);
-    
-    return () => clearInterval(interval);
+    fetchDataRef.current = fetchData;
+
+    // El backend avisa por SSE cuando cambia un pedido; solo ahí se recarga.
+    // Se deja un refresco lento por si la conexión se corta.
+    const interval = setInterval(fetchData, 60000);
+
+    return () => {
+      clearInterval(interval);
+    };
   }, [tab, pedidoView, pedidoFilter, headers]);
 
   return (
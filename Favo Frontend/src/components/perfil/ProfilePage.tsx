@@ -10,11 +10,8 @@ const normalizeUserData = async (currentUser: any) => {
   // Normalizar descripción
   currentUser.descripcion = currentUser.descripcion || currentUser.description || currentUser.desc || currentUser.bio || currentUser.about || currentUser.descripcion_text || '';
   
-  // Normalizar foto: el backend puede devolver foto_perfil (base64 sin prefijo)
-  // o foto_perfil_base64. Asegurar que foto_perfil_base64 tenga el valor correcto
-  if (currentUser.foto_perfil && !currentUser.foto_perfil_base64) {
-    currentUser.foto_perfil_base64 = currentUser.foto_perfil;
-  }
+  // Normalizar foto: el backend devuelve foto_perfil como ruta (/usuarios/{id}/foto?v=...)
+  currentUser.foto_url = currentUser.foto_perfil ? `${API_URL}${currentUser.foto_perfil}` : null;
   
   // Obtener ubicación si existe
   if (currentUser.id_ubicacion) {
@@ -184,10 +181,8 @@ export const ProfilePage = () => {
       <div className="bg-white rounded-lg shadow-sm p-6 mb-6">
         <div className="flex items-start gap-6">
           <img src={
-            user?.foto_perfil_base64 
-              ? (user.foto_perfil_base64.startsWith('data:') 
-                  ? user.foto_perfil_base64 
-                  : `data:image/jpeg;base64,${user.foto_perfil_base64}`)
+            user?.foto_url 
+              ? user.foto_url
               : `https://ui-avatars.com/api/?name=${encodeURIComponent(user?.nombre || user?.mail || 'User')}&background=fff&color=1f2937`
           } alt="Foto de perfil" className="w-40 h-40 rounded-full border-4 border-white shadow-md object-cover" />
           
@@ -318,10 +313,8 @@ export const ProfilePage = () => {
                             src={
                               photoBase64 
                                 ? `data:image/jpeg;base64,${photoBase64}`
-                                : (user?.foto_perfil_base64 
-                                    ? (user.foto_perfil_base64.startsWith('data:') 
-                                        ? user.foto_perfil_base64 
-                                        : `data:image/jpeg;base64,${user.foto_perfil_base64}`)
+                                : (user?.foto_url 
+                                    ? user.foto_url
                                     : `https://ui-avatars.com/api/?name=${encodeURIComponent(user?.nombre || 'User')}&background=fff&color=1f2937`)
                             }
                             alt="Vista previa"
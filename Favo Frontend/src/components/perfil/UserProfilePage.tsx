@@ -227,7 +227,7 @@ export const UserProfilePage = () => {
       <div className="bg-white rounded-lg shadow-sm p-6 mb-6">
         <div className="flex items-start gap-6">
           <img 
-            src={usuario.foto_perfil || `https://ui-avatars.com/api/?name=${encodeURIComponent(usuario.nombre || 'Usuario')}&background=fff&color=1f2937`}
+            src={usuario.foto_perfil ? `${API_URL}${usuario.foto_perfil}` : `https://ui-avatars.com/api/?name=${encodeURIComponent(usuario.nombre || 'Usuario')}&background=fff&color=1f2937`}
             alt={usuario.nombre}
             className="w-40 h-40 rounded-full border-4 border-white shadow-md object-cover"
           />
@@ -0,0 +1,53 @@
+import { useEffect, useRef } from 'react';
+import { getToken } from './useToken';
+
+const API_URL = 'https://favo-iy6h.onrender.com';
+const REINTENTO_MS = 5000;
+
+/**
+ * Abre el stream SSE de /eventos mientras `activo` sea true.
+ * EventSource no manda headers y el JWT no debe ir en la URL, así que antes de cada
+ * conexión se pide un ticket de un solo uso a POST /eventos/ticket. Como el ticket
+ * no sirve para reconectar, ante un error se cierra y se vuelve a pedir otro.
+ * `handlers` puede cambiar en cada render sin reabrir la conexión.
+ */
+export const useEventos = (activo: boolean, handlers: Record<string, () => void>) => {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    if (!activo) return;
+    let cerrado = false;
+    let eventos: EventSource | null = null;
+    let reintento: ReturnType<typeof setTimeout> | undefined;
+
+    const conectar = async () => {
+      try {
+        const res = await fetch(`${API_URL}/eventos/ticket`, {
+          method: 'POST',
+          headers: { 'Authorization': `Bearer ${getToken()}` }
+        });
+        if (!res.ok) throw new Error(`ticket ${res.status}`);
+        const { ticket } = await res.json();
+        if (cerrado) return;
+        eventos = new EventSource(`${API_URL}/eventos?ticket=${encodeURIComponent(ticket)}`);
+        Object.keys(handlersRef.current).forEach(tipo =>
+          eventos!.addEventListener(tipo, () => handlersRef.current[tipo]?.())
+        );
+        eventos.onerror = () => {
+          eventos?.close();
+          if (!cerrado) reintento = setTimeout(conectar, REINTENTO_MS);
+        };
+      } catch {
+        if (!cerrado) reintento = setTimeout(conectar, REINTENTO_MS);
+      }
+    };
+    conectar();
+
+    return () => {
+      cerrado = true;
+      clearTimeout(reintento);
+      eventos?.close();
+    };
+  }, [activo]);
+};
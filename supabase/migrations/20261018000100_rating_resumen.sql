@@ -0,0 +1,87 @@
+-- Resumen de ratings por usuario: cantidad, suma e histograma por estrellas.
+-- Se mantiene de forma incremental desde registrar_rating, así el promedio
+-- y el ranking de destacados no necesitan recorrer toda la tabla rating.
+CREATE TABLE IF NOT EXISTS rating_resumen (
+    id_usuario BIGINT PRIMARY KEY REFERENCES "Usuario"(id_usuario) ON DELETE CASCADE,
+    cantidad INTEGER NOT NULL DEFAULT 0,
+    suma INTEGER NOT NULL DEFAULT 0,
+    s1 INTEGER NOT NULL DEFAULT 0,
+    s2 INTEGER NOT NULL DEFAULT 0,
+    s3 INTEGER NOT NULL DEFAULT 0,
+    s4 INTEGER NOT NULL DEFAULT 0,
+    s5 INTEGER NOT NULL DEFAULT 0,
+    promedio NUMERIC GENERATED ALWAYS AS (
+        CASE WHEN cantidad > 0 THEN ROUND(suma::numeric / cantidad, 2) ELSE 0 END
+    ) STORED,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_rating_resumen_ranking ON rating_resumen (cantidad DESC, promedio DESC);
+
+-- Cargar los ratings que ya existen
+INSERT INTO rating_resumen (id_usuario, cantidad, suma, s1, s2, s3, s4, s5)
+SELECT
+    rated_id,
+    COUNT(*),
+    SUM(score),
+    COUNT(*) FILTER (WHERE score = 1),
+    COUNT(*) FILTER (WHERE score = 2),
+    COUNT(*) FILTER (WHERE score = 3),
+    COUNT(*) FILTER (WHERE score = 4),
+    COUNT(*) FILTER (WHERE score = 5)
+FROM rating
+GROUP BY rated_id
+ON CONFLICT (id_usuario) DO NOTHING;
+
+-- Crea o actualiza el rating de p_rater_id a p_rated_id y ajusta el resumen
+-- en la misma transacción. Si el rating ya existía se descuenta el score anterior.
+CREATE OR REPLACE FUNCTION registrar_rating(
+    p_rater_id BIGINT,
+    p_rated_id BIGINT,
+    p_score INTEGER,
+    p_comment TEXT DEFAULT NULL
+)
+RETURNS rating
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_anterior INTEGER;
+    v_fila rating;
+BEGIN
+    IF p_score < 1 OR p_score > 5 THEN
+        RAISE EXCEPTION 'Rating debe estar entre 1 y 5';
+    END IF;
+
+    SELECT score INTO v_anterior
+    FROM rating
+    WHERE rated_id = p_rated_id AND rater_id = p_rater_id
+    FOR UPDATE;
+
+    IF FOUND THEN
+        UPDATE rating
+        SET score = p_score, comment = p_comment
+        WHERE rated_id = p_rated_id AND rater_id = p_rater_id
+        RETURNING * INTO v_fila;
+    ELSE
+        INSERT INTO rating (rated_id, rater_id, score, comment)
+        VALUES (p_rated_id, p_rater_id, p_score, p_comment)
+        RETURNING * INTO v_fila;
+    END IF;
+
+    INSERT INTO rating_resumen (id_usuario) VALUES (p_rated_id)
+    ON CONFLICT (id_usuario) DO NOTHING;
+
+    UPDATE rating_resumen SET
+        cantidad = cantidad + CASE WHEN v_anterior IS NULL THEN 1 ELSE 0 END,
+        suma = suma + p_score - COALESCE(v_anterior, 0),
+        s1 = s1 + (p_score = 1)::int - COALESCE(v_anterior = 1, false)::int,
+        s2 = s2 + (p_score = 2)::int - COALESCE(v_anterior = 2, false)::int,
+        s3 = s3 + (p_score = 3)::int - COALESCE(v_anterior = 3, false)::int,
+        s4 = s4 + (p_score = 4)::int - COALESCE(v_anterior = 4, false)::int,
+        s5 = s5 + (p_score = 5)::int - COALESCE(v_anterior = 5, false)::int,
+        updated_at = now()
+    WHERE id_usuario = p_rated_id;
+
+    RETURN v_fila;
+END;
+$$;
@@ -0,0 +1,139 @@
+-- Búsqueda de texto indexada para Servicio y Usuario.
+-- tsvector en español sin acentos (con pesos: título/nombre > descripción)
+-- más trigramas para tolerar errores de tipeo. Reemplaza los filtros
+-- ilike '%q%' que no podían usar índices.
+-- En Supabase las extensiones van en el schema `extensions`, no en `public`
+CREATE SCHEMA IF NOT EXISTS extensions;
+CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA extensions;
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+
+-- unaccent() no es IMMUTABLE; este wrapper sí, para poder usarlo en índices
+-- y columnas generadas. Función y diccionario van calificados con el schema
+-- para no depender del search_path (en columnas generadas y restores es otro).
+-- Lo mismo con pg_trgm: extensions.gin_trgm_ops, extensions.similarity() y
+-- OPERATOR(extensions.%).
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT extensions.unaccent('extensions.unaccent', $1) $$;
+
+-- Arma un tsquery con prefijos ("plom" encuentra "plomero") a partir de texto libre.
+-- Descarta cualquier carácter que no sea letra o número, así el input del
+-- usuario nunca se interpreta como sintaxis.
+CREATE OR REPLACE FUNCTION f_tsquery_prefijo(p_q text)
+RETURNS tsquery
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT to_tsquery('spanish', string_agg(quote_literal(token) || ':*', ' & '))
+    FROM regexp_split_to_table(lower(f_unaccent(coalesce(p_q, ''))), '[^[:alnum:]]+') AS token
+    WHERE token <> ''
+$$;
+
+-- ----- Servicio -----
+ALTER TABLE "Servicio" ADD COLUMN IF NOT EXISTS busqueda tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', f_unaccent(coalesce(titulo, ''))), 'A') ||
+        setweight(to_tsvector('spanish', f_unaccent(coalesce(descripcion, ''))), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_servicio_busqueda ON "Servicio" USING GIN (busqueda);
+CREATE INDEX IF NOT EXISTS idx_servicio_titulo_trgm ON "Servicio" USING GIN (lower(f_unaccent(titulo)) extensions.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_servicio_categoria ON "Servicio" (id_categoria, id_servicio DESC);
+
+-- total (el conteo de todas las coincidencias) solo se calcula con p_total:
+-- el subselect del CASE no se ejecuta si no se lee, así que una página común
+-- corta en LIMIT sin recorrer el resto.
+CREATE OR REPLACE FUNCTION buscar_servicios(
+    p_q text,
+    p_id_categoria bigint DEFAULT NULL,
+    p_limit integer DEFAULT 20,
+    p_offset integer DEFAULT 0,
+    p_total boolean DEFAULT false
+)
+RETURNS TABLE (
+    id_servicio bigint,
+    titulo varchar,
+    descripcion varchar,
+    id_usuario bigint,
+    id_categoria bigint,
+    activo boolean,
+    nombre_usuario varchar,
+    relevancia real,
+    total bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH consulta AS (
+        SELECT f_tsquery_prefijo(p_q) AS tsq, lower(f_unaccent(p_q)) AS texto
+    ),
+    coincidencias AS NOT MATERIALIZED (
+        SELECT s.*, c.tsq, c.texto
+        FROM "Servicio" s
+        CROSS JOIN consulta c
+        WHERE (s.busqueda @@ c.tsq OR lower(f_unaccent(s.titulo)) OPERATOR(extensions.%) c.texto)
+          AND (p_id_categoria IS NULL OR s.id_categoria = p_id_categoria)
+    )
+    SELECT
+        m.id_servicio, m.titulo, m.descripcion, m.id_usuario, m.id_categoria, m.activo,
+        u.nombre,
+        (ts_rank_cd(m.busqueda, m.tsq) + extensions.similarity(lower(f_unaccent(m.titulo)), m.texto))::real AS relevancia,
+        CASE WHEN p_total THEN (SELECT count(*) FROM coincidencias) END AS total
+    FROM coincidencias m
+    LEFT JOIN "Usuario" u ON u.id_usuario = m.id_usuario
+    ORDER BY relevancia DESC, m.id_servicio DESC
+    LIMIT p_limit OFFSET p_offset
+$$;
+
+-- ----- Usuario -----
+ALTER TABLE "Usuario" ADD COLUMN IF NOT EXISTS busqueda tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', f_unaccent(coalesce(nombre, ''))), 'A') ||
+        setweight(to_tsvector('spanish', f_unaccent(coalesce(descripcion, ''))), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_usuario_busqueda ON "Usuario" USING GIN (busqueda);
+CREATE INDEX IF NOT EXISTS idx_usuario_nombre_trgm ON "Usuario" USING GIN (lower(f_unaccent(nombre)) extensions.gin_trgm_ops);
+
+-- p_id_categoria filtra a los usuarios que ofrecen algún servicio en esa categoría
+CREATE OR REPLACE FUNCTION buscar_usuarios(
+    p_q text,
+    p_id_categoria bigint DEFAULT NULL,
+    p_limit integer DEFAULT 10,
+    p_offset integer DEFAULT 0,
+    p_total boolean DEFAULT false
+)
+RETURNS TABLE (
+    id_usuario bigint,
+    nombre varchar,
+    descripcion text,
+    foto_perfil text,
+    verificado boolean,
+    relevancia real,
+    total bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH consulta AS (
+        SELECT f_tsquery_prefijo(p_q) AS tsq, lower(f_unaccent(p_q)) AS texto
+    ),
+    coincidencias AS NOT MATERIALIZED (
+        SELECT u.*, c.tsq, c.texto
+        FROM "Usuario" u
+        CROSS JOIN consulta c
+        WHERE (u.busqueda @@ c.tsq OR lower(f_unaccent(u.nombre)) OPERATOR(extensions.%) c.texto)
+          AND (
+              p_id_categoria IS NULL
+              OR EXISTS (
+                  SELECT 1 FROM "Servicio" s
+                  WHERE s.id_usuario = u.id_usuario AND s.id_categoria = p_id_categoria
+              )
+          )
+    )
+    SELECT
+        u.id_usuario, u.nombre, u.descripcion::text, u.foto_perfil::text, u.verificado,
+        (ts_rank_cd(u.busqueda, u.tsq) + extensions.similarity(lower(f_unaccent(u.nombre)), u.texto))::real AS relevancia,
+        CASE WHEN p_total THEN (SELECT count(*) FROM coincidencias) END AS total
+    FROM coincidencias u
+    ORDER BY relevancia DESC, u.id_usuario
+    LIMIT p_limit OFFSET p_offset
+$$;
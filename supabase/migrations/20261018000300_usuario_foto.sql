@@ -0,0 +1,112 @@
+-- Fotos de perfil fuera de la fila Usuario.
+-- Cada imagen se guarda una sola vez en usuario_foto, direccionada por el
+-- sha256 de su contenido; Usuario solo guarda el hash. Así los select sobre
+-- Usuario (perfil, búsqueda, destacados) ya no arrastran la imagen inline.
+CREATE TABLE IF NOT EXISTS usuario_foto (
+    hash TEXT PRIMARY KEY,
+    mime TEXT NOT NULL,
+    contenido TEXT NOT NULL, -- base64
+    bytes INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE "Usuario" ADD COLUMN IF NOT EXISTS foto_hash TEXT REFERENCES usuario_foto(hash);
+
+-- Migrar las fotos existentes. foto_perfil guardaba el base64 como texto
+-- (en instalaciones viejas dentro de una columna bytea).
+DO $$
+DECLARE
+    v_tipo TEXT;
+    v_expr TEXT;
+BEGIN
+    SELECT data_type INTO v_tipo
+    FROM information_schema.columns
+    WHERE table_name = 'Usuario' AND column_name = 'foto_perfil';
+
+    IF v_tipo IS NULL THEN
+        RETURN;
+    END IF;
+
+    v_expr := CASE WHEN v_tipo = 'bytea'
+        THEN 'convert_from(foto_perfil, ''UTF8'')'
+        ELSE 'foto_perfil::text'
+    END;
+
+    EXECUTE format($f$
+        CREATE TEMP TABLE foto_migracion ON COMMIT DROP AS
+        SELECT id_usuario, decode(regexp_replace(%s, '^data:[^,]*,', ''), 'base64') AS contenido
+        FROM "Usuario"
+        WHERE foto_perfil IS NOT NULL AND foto_hash IS NULL
+    $f$, v_expr);
+
+    INSERT INTO usuario_foto (hash, mime, contenido, bytes)
+    SELECT DISTINCT ON (h.hash)
+        h.hash,
+        CASE
+            WHEN substring(h.contenido FROM 1 FOR 3) = '\xffd8ff'::bytea THEN 'image/jpeg'
+            WHEN substring(h.contenido FROM 1 FOR 4) = '\x89504e47'::bytea THEN 'image/png'
+            WHEN substring(h.contenido FROM 1 FOR 4) = '\x47494638'::bytea THEN 'image/gif'
+            WHEN substring(h.contenido FROM 9 FOR 4) = '\x57454250'::bytea THEN 'image/webp'
+            ELSE 'application/octet-stream'
+        END,
+        encode(h.contenido, 'base64'),
+        length(h.contenido)
+    FROM (
+        SELECT encode(sha256(contenido), 'hex') AS hash, contenido
+        FROM foto_migracion
+        WHERE length(contenido) > 0
+    ) h
+    ON CONFLICT (hash) DO NOTHING;
+
+    UPDATE "Usuario" u
+    SET foto_hash = encode(sha256(m.contenido), 'hex'), foto_perfil = NULL
+    FROM foto_migracion m
+    WHERE u.id_usuario = m.id_usuario AND length(m.contenido) > 0;
+END;
+$$;
+
+-- buscar_usuarios devuelve el hash en lugar de la foto inline
+DROP FUNCTION IF EXISTS buscar_usuarios(text, bigint, integer, integer, boolean);
+
+CREATE OR REPLACE FUNCTION buscar_usuarios(
+    p_q text,
+    p_id_categoria bigint DEFAULT NULL,
+    p_limit integer DEFAULT 10,
+    p_offset integer DEFAULT 0,
+    p_total boolean DEFAULT false
+)
+RETURNS TABLE (
+    id_usuario bigint,
+    nombre varchar,
+    descripcion text,
+    foto_hash text,
+    verificado boolean,
+    relevancia real,
+    total bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH consulta AS (
+        SELECT f_tsquery_prefijo(p_q) AS tsq, lower(f_unaccent(p_q)) AS texto
+    ),
+    coincidencias AS NOT MATERIALIZED (
+        SELECT u.*, c.tsq, c.texto
+        FROM "Usuario" u
+        CROSS JOIN consulta c
+        WHERE (u.busqueda @@ c.tsq OR lower(f_unaccent(u.nombre)) OPERATOR(extensions.%) c.texto)
+          AND (
+              p_id_categoria IS NULL
+              OR EXISTS (
+                  SELECT 1 FROM "Servicio" s
+                  WHERE s.id_usuario = u.id_usuario AND s.id_categoria = p_id_categoria
+              )
+          )
+    )
+    SELECT
+        u.id_usuario, u.nombre, u.descripcion::text, u.foto_hash, u.verificado,
+        (ts_rank_cd(u.busqueda, u.tsq) + extensions.similarity(lower(f_unaccent(u.nombre)), u.texto))::real AS relevancia,
+        CASE WHEN p_total THEN (SELECT count(*) FROM coincidencias) END AS total
+    FROM coincidencias u
+    ORDER BY relevancia DESC, u.id_usuario
+    LIMIT p_limit OFFSET p_offset
+$$;
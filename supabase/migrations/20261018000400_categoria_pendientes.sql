@@ -0,0 +1,48 @@
+-- Cantidad de pedidos pendientes por categoría, mantenida por trigger.
+-- Cubre todas las transiciones (alta, aceptar, completar, borrar, cambios de
+-- categoría) sin importar desde qué endpoint se hagan, así /categorias no
+-- necesita contar la tabla Pedido en cada request.
+CREATE TABLE IF NOT EXISTS categoria_pendientes (
+    id_categoria BIGINT PRIMARY KEY REFERENCES "Categoria"(id_categoria) ON DELETE CASCADE,
+    pendientes INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_pedido_pendiente_categoria ON "Pedido" (id_categoria) WHERE status = 'pendiente';
+
+CREATE OR REPLACE FUNCTION ajustar_categoria_pendientes(p_id_categoria BIGINT, p_delta INTEGER)
+RETURNS void
+LANGUAGE sql
+AS $$
+    INSERT INTO categoria_pendientes AS cp (id_categoria, pendientes)
+    VALUES (p_id_categoria, GREATEST(p_delta, 0))
+    ON CONFLICT (id_categoria)
+    DO UPDATE SET pendientes = GREATEST(cp.pendientes + p_delta, 0)
+$$;
+
+CREATE OR REPLACE FUNCTION pedido_pendientes_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'pendiente' AND OLD.id_categoria IS NOT NULL THEN
+        PERFORM ajustar_categoria_pendientes(OLD.id_categoria, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'pendiente' AND NEW.id_categoria IS NOT NULL THEN
+        PERFORM ajustar_categoria_pendientes(NEW.id_categoria, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS pedido_pendientes ON "Pedido";
+CREATE TRIGGER pedido_pendientes
+AFTER INSERT OR DELETE OR UPDATE OF status, id_categoria ON "Pedido"
+FOR EACH ROW EXECUTE FUNCTION pedido_pendientes_trigger();
+
+-- Cargar los conteos actuales
+INSERT INTO categoria_pendientes (id_categoria, pendientes)
+SELECT c.id_categoria, COUNT(p.id_pedidos)
+FROM "Categoria" c
+LEFT JOIN "Pedido" p ON p.id_categoria = c.id_categoria AND p.status = 'pendiente'
+GROUP BY c.id_categoria
+ON CONFLICT (id_categoria) DO UPDATE SET pendientes = EXCLUDED.pendientes;
@@ -0,0 +1,100 @@
+-- Sincronización incremental (?since=) para notificaciones y pedidos.
+-- Cada fila lleva modificado_at (lo pone un trigger en insert/update) y los
+-- borrados dejan una lápida en `eliminados`, una por usuario afectado, para
+-- que los clientes puedan pedir solo lo que cambió desde su último token.
+CREATE TABLE IF NOT EXISTS eliminados (
+    id BIGSERIAL PRIMARY KEY,
+    tabla TEXT NOT NULL,
+    id_fila BIGINT NOT NULL,
+    id_usuario BIGINT NOT NULL,
+    eliminado_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS idx_eliminados_usuario ON eliminados (tabla, id_usuario, eliminado_at);
+
+CREATE OR REPLACE FUNCTION marcar_modificado()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.modificado_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$;
+
+-- TG_ARGV: columnas con los usuarios que deben enterarse del borrado
+CREATE OR REPLACE FUNCTION registrar_eliminado()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_fila JSONB := to_jsonb(OLD);
+    v_pk TEXT := TG_ARGV[0];
+    v_campo TEXT;
+BEGIN
+    FOREACH v_campo IN ARRAY TG_ARGV[1:] LOOP
+        IF v_fila ->> v_campo IS NOT NULL THEN
+            INSERT INTO eliminados (tabla, id_fila, id_usuario)
+            VALUES (TG_TABLE_NAME, (v_fila ->> v_pk)::bigint, (v_fila ->> v_campo)::bigint);
+        END IF;
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+
+-- ----- notificaciones_servicios -----
+ALTER TABLE notificaciones_servicios ADD COLUMN IF NOT EXISTS modificado_at TIMESTAMPTZ NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_notif_servicios_sync ON notificaciones_servicios (id_usuario, modificado_at);
+
+DROP TRIGGER IF EXISTS notif_servicios_modificado ON notificaciones_servicios;
+CREATE TRIGGER notif_servicios_modificado
+BEFORE INSERT OR UPDATE ON notificaciones_servicios
+FOR EACH ROW EXECUTE FUNCTION marcar_modificado();
+
+DROP TRIGGER IF EXISTS notif_servicios_eliminado ON notificaciones_servicios;
+CREATE TRIGGER notif_servicios_eliminado
+AFTER DELETE ON notificaciones_servicios
+FOR EACH ROW EXECUTE FUNCTION registrar_eliminado('id', 'id_usuario', 'id_usuario_origen');
+
+-- ----- notificaciones_pedidos -----
+ALTER TABLE notificaciones_pedidos ADD COLUMN IF NOT EXISTS modificado_at TIMESTAMPTZ NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_notif_pedidos_sync ON notificaciones_pedidos (id_usuario, modificado_at);
+
+DROP TRIGGER IF EXISTS notif_pedidos_modificado ON notificaciones_pedidos;
+CREATE TRIGGER notif_pedidos_modificado
+BEFORE INSERT OR UPDATE ON notificaciones_pedidos
+FOR EACH ROW EXECUTE FUNCTION marcar_modificado();
+
+DROP TRIGGER IF EXISTS notif_pedidos_eliminado ON notificaciones_pedidos;
+CREATE TRIGGER notif_pedidos_eliminado
+AFTER DELETE ON notificaciones_pedidos
+FOR EACH ROW EXECUTE FUNCTION registrar_eliminado('id', 'id_usuario');
+
+-- ----- notificaciones_pedidos_respuestas -----
+ALTER TABLE notificaciones_pedidos_respuestas ADD COLUMN IF NOT EXISTS modificado_at TIMESTAMPTZ NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_notif_respuestas_sync ON notificaciones_pedidos_respuestas (id_usuario_destino, modificado_at);
+
+DROP TRIGGER IF EXISTS notif_respuestas_modificado ON notificaciones_pedidos_respuestas;
+CREATE TRIGGER notif_respuestas_modificado
+BEFORE INSERT OR UPDATE ON notificaciones_pedidos_respuestas
+FOR EACH ROW EXECUTE FUNCTION marcar_modificado();
+
+DROP TRIGGER IF EXISTS notif_respuestas_eliminado ON notificaciones_pedidos_respuestas;
+CREATE TRIGGER notif_respuestas_eliminado
+AFTER DELETE ON notificaciones_pedidos_respuestas
+FOR EACH ROW EXECUTE FUNCTION registrar_eliminado('id', 'id_usuario_destino', 'id_usuario_origen');
+
+-- ----- Pedido -----
+ALTER TABLE "Pedido" ADD COLUMN IF NOT EXISTS modificado_at TIMESTAMPTZ NOT NULL DEFAULT now();
+CREATE INDEX IF NOT EXISTS idx_pedido_owner_sync ON "Pedido" (id_usuario, modificado_at);
+CREATE INDEX IF NOT EXISTS idx_pedido_accepted_sync ON "Pedido" (accepted_by, modificado_at);
+
+DROP TRIGGER IF EXISTS pedido_modificado ON "Pedido";
+CREATE TRIGGER pedido_modificado
+BEFORE INSERT OR UPDATE ON "Pedido"
+FOR EACH ROW EXECUTE FUNCTION marcar_modificado();
+
+DROP TRIGGER IF EXISTS pedido_eliminado ON "Pedido";
+CREATE TRIGGER pedido_eliminado
+AFTER DELETE ON "Pedido"
+FOR EACH ROW EXECUTE FUNCTION registrar_eliminado('id_pedidos', 'id_usuario', 'accepted_by');
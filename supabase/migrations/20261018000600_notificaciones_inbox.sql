@@ -0,0 +1,173 @@
+-- Bandeja unificada de notificaciones y contadores de no leídas.
+-- Las tres tablas de notificaciones se exponen como una sola vista ordenable
+-- por fecha, y un trigger por tabla mantiene notificaciones_no_leidas para que
+-- el badge del header sea una lectura por clave primaria.
+ALTER TABLE notificaciones_servicios ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE notificaciones_pedidos ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now();
+-- notificaciones_pedidos no tenía estado de lectura; el "ok" del usuario ahora la marca como vista
+ALTER TABLE notificaciones_pedidos ADD COLUMN IF NOT EXISTS visto BOOLEAN NOT NULL DEFAULT false;
+
+CREATE INDEX IF NOT EXISTS idx_notif_servicios_inbox ON notificaciones_servicios (id_usuario, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_notif_pedidos_inbox ON notificaciones_pedidos (id_usuario, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_notif_respuestas_inbox ON notificaciones_pedidos_respuestas (id_usuario_destino, created_at DESC);
+
+-- clave: orden total y estable (fecha, origen, id) para paginar por keyset
+CREATE OR REPLACE VIEW notificaciones_inbox AS
+SELECT
+    'servicio'::text AS origen,
+    id::bigint AS id,
+    id_usuario::bigint AS id_usuario,
+    id_usuario_origen::bigint AS id_usuario_origen,
+    'solicitud'::text AS tipo,
+    titulo::text AS titulo,
+    "desc"::text AS descripcion,
+    precio::float8 AS precio,
+    NULL::float8 AS precio_nuevo,
+    (accepted_by IS NOT NULL) AS visto,
+    created_at,
+    to_char(created_at AT TIME ZONE 'UTC', 'YYYYMMDDHH24MISSUS') || ':servicio:' || lpad(id::text, 19, '0') AS clave
+FROM notificaciones_servicios
+UNION ALL
+SELECT
+    'pedido'::text,
+    id::bigint,
+    id_usuario::bigint,
+    accepted_by::bigint,
+    'pedido_aceptado'::text,
+    titulo::text,
+    "desc"::text,
+    precio::float8,
+    NULL::float8,
+    visto,
+    created_at,
+    to_char(created_at AT TIME ZONE 'UTC', 'YYYYMMDDHH24MISSUS') || ':pedido:' || lpad(id::text, 19, '0')
+FROM notificaciones_pedidos
+UNION ALL
+SELECT
+    'respuesta'::text,
+    id::bigint,
+    id_usuario_destino::bigint,
+    id_usuario_origen::bigint,
+    tipo::text,
+    titulo::text,
+    descripcion::text,
+    precio_anterior::float8,
+    precio_nuevo::float8,
+    visto,
+    created_at,
+    to_char(created_at AT TIME ZONE 'UTC', 'YYYYMMDDHH24MISSUS') || ':respuesta:' || lpad(id::text, 19, '0')
+FROM notificaciones_pedidos_respuestas;
+
+-- ----- Contadores de no leídas -----
+CREATE TABLE IF NOT EXISTS notificaciones_no_leidas (
+    id_usuario BIGINT PRIMARY KEY,
+    servicios INTEGER NOT NULL DEFAULT 0,
+    pedidos INTEGER NOT NULL DEFAULT 0,
+    respuestas INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION ajustar_no_leidas(p_id_usuario BIGINT, p_columna TEXT, p_delta INTEGER)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_id_usuario IS NULL OR p_delta = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO notificaciones_no_leidas (id_usuario) VALUES (p_id_usuario)
+    ON CONFLICT (id_usuario) DO NOTHING;
+    EXECUTE format(
+        'UPDATE notificaciones_no_leidas SET %1$I = GREATEST(%1$I + $1, 0) WHERE id_usuario = $2',
+        p_columna
+    ) USING p_delta, p_id_usuario;
+END;
+$$;
+
+-- Qué cuenta como "no leída" en cada tabla y a quién le corresponde
+CREATE OR REPLACE FUNCTION notificacion_no_leida_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_old_usuario BIGINT;
+    v_new_usuario BIGINT;
+    v_old_cuenta BOOLEAN := false;
+    v_new_cuenta BOOLEAN := false;
+    v_columna TEXT;
+BEGIN
+    IF TG_TABLE_NAME = 'notificaciones_servicios' THEN
+        v_columna := 'servicios';
+        IF TG_OP <> 'INSERT' THEN
+            v_old_usuario := OLD.id_usuario;
+            v_old_cuenta := OLD.accepted_by IS NULL;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_usuario := NEW.id_usuario;
+            v_new_cuenta := NEW.accepted_by IS NULL;
+        END IF;
+    ELSIF TG_TABLE_NAME = 'notificaciones_pedidos' THEN
+        v_columna := 'pedidos';
+        IF TG_OP <> 'INSERT' THEN
+            v_old_usuario := OLD.id_usuario;
+            v_old_cuenta := NOT OLD.visto;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_usuario := NEW.id_usuario;
+            v_new_cuenta := NOT NEW.visto;
+        END IF;
+    ELSE
+        v_columna := 'respuestas';
+        IF TG_OP <> 'INSERT' THEN
+            v_old_usuario := OLD.id_usuario_destino;
+            v_old_cuenta := NOT COALESCE(OLD.visto, false);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            v_new_usuario := NEW.id_usuario_destino;
+            v_new_cuenta := NOT COALESCE(NEW.visto, false);
+        END IF;
+    END IF;
+
+    IF v_old_cuenta THEN
+        PERFORM ajustar_no_leidas(v_old_usuario, v_columna, -1);
+    END IF;
+    IF v_new_cuenta THEN
+        PERFORM ajustar_no_leidas(v_new_usuario, v_columna, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS notif_servicios_no_leidas ON notificaciones_servicios;
+CREATE TRIGGER notif_servicios_no_leidas
+AFTER INSERT OR DELETE OR UPDATE OF id_usuario, accepted_by ON notificaciones_servicios
+FOR EACH ROW EXECUTE FUNCTION notificacion_no_leida_trigger();
+
+DROP TRIGGER IF EXISTS notif_pedidos_no_leidas ON notificaciones_pedidos;
+CREATE TRIGGER notif_pedidos_no_leidas
+AFTER INSERT OR DELETE OR UPDATE OF id_usuario, visto ON notificaciones_pedidos
+FOR EACH ROW EXECUTE FUNCTION notificacion_no_leida_trigger();
+
+DROP TRIGGER IF EXISTS notif_respuestas_no_leidas ON notificaciones_pedidos_respuestas;
+CREATE TRIGGER notif_respuestas_no_leidas
+AFTER INSERT OR DELETE OR UPDATE OF id_usuario_destino, visto ON notificaciones_pedidos_respuestas
+FOR EACH ROW EXECUTE FUNCTION notificacion_no_leida_trigger();
+
+-- Cargar los contadores actuales
+INSERT INTO notificaciones_no_leidas (id_usuario, servicios, pedidos, respuestas)
+SELECT id_usuario, SUM(servicios), SUM(pedidos), SUM(respuestas)
+FROM (
+    SELECT id_usuario, COUNT(*) AS servicios, 0 AS pedidos, 0 AS respuestas
+    FROM notificaciones_servicios WHERE accepted_by IS NULL GROUP BY id_usuario
+    UNION ALL
+    SELECT id_usuario, 0, COUNT(*), 0
+    FROM notificaciones_pedidos WHERE NOT visto GROUP BY id_usuario
+    UNION ALL
+    SELECT id_usuario_destino, 0, 0, COUNT(*)
+    FROM notificaciones_pedidos_respuestas WHERE NOT COALESCE(visto, false) GROUP BY id_usuario_destino
+) t
+WHERE id_usuario IS NOT NULL
+GROUP BY id_usuario
+ON CONFLICT (id_usuario) DO UPDATE SET
+    servicios = EXCLUDED.servicios,
+    pedidos = EXCLUDED.pedidos,
+    respuestas = EXCLUDED.respuestas;
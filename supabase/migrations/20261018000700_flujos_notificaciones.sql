@@ -0,0 +1,194 @@
+-- Flujos de aceptar / rechazar / contraofertar como funciones transaccionales.
+-- Cada flujo es un solo RPC: lee y bloquea la notificación, toma el nombre de
+-- quien actúa, inserta lo que corresponda (Pedido y/o respuesta) y borra o
+-- actualiza el original, todo en la misma transacción. Si algo falla no queda
+-- nada a medio aplicar.
+-- Los errores usan SQLSTATE PTxxx: PostgREST los devuelve con el status HTTP xxx.
+
+-- Quien recibe una solicitud de servicio la acepta: se crea el Pedido en proceso
+CREATE OR REPLACE FUNCTION aceptar_solicitud_servicio(p_id_notif BIGINT, p_id_usuario BIGINT)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_notif notificaciones_servicios;
+    v_pedido "Pedido";
+BEGIN
+    SELECT * INTO v_notif FROM notificaciones_servicios WHERE id = p_id_notif FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE SQLSTATE 'PT404' USING MESSAGE = 'Notificación no encontrada';
+    END IF;
+    IF v_notif.id_usuario IS DISTINCT FROM p_id_usuario THEN
+        RAISE SQLSTATE 'PT403' USING MESSAGE = 'No autorizado para aceptar esta notificación';
+    END IF;
+    IF v_notif.accepted_by IS NOT NULL THEN
+        RAISE SQLSTATE 'PT409' USING MESSAGE = 'La solicitud ya fue aceptada';
+    END IF;
+
+    INSERT INTO "Pedido" (titulo, descripcion, precio, id_categoria, id_usuario, accepted_by, accepted_at, status)
+    VALUES (v_notif.titulo, v_notif."desc", v_notif.precio, 1, v_notif.id_usuario_origen, p_id_usuario, now(), 'en_proceso')
+    RETURNING * INTO v_pedido;
+
+    UPDATE notificaciones_servicios
+    SET accepted_by = p_id_usuario, accepted_at = now()
+    WHERE id = p_id_notif
+    RETURNING * INTO v_notif;
+
+    RETURN jsonb_build_object('pedido', to_jsonb(v_pedido), 'notificacion', to_jsonb(v_notif));
+END;
+$$;
+
+-- Respuesta a una solicitud de servicio (aceptado / rechazado / contraoferta):
+-- crea la notificación de respuesta para quien la pidió y borra la solicitud.
+-- p_conservar_desc: la contraoferta hecha desde la solicitud copia su descripción.
+CREATE OR REPLACE FUNCTION responder_solicitud_servicio(
+    p_id_notif BIGINT,
+    p_id_usuario BIGINT,
+    p_tipo TEXT,
+    p_precio_nuevo FLOAT8 DEFAULT NULL,
+    p_comentario TEXT DEFAULT NULL,
+    p_conservar_desc BOOLEAN DEFAULT false
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_notif notificaciones_servicios;
+    v_nombre TEXT;
+    v_titulo TEXT;
+    v_descripcion TEXT;
+    v_respuesta notificaciones_pedidos_respuestas;
+BEGIN
+    IF p_tipo NOT IN ('aceptado', 'rechazado', 'contraoferta') THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = 'Tipo de respuesta inválido';
+    END IF;
+    IF p_tipo = 'contraoferta' AND (p_precio_nuevo IS NULL OR p_precio_nuevo <= 0) THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = 'Precio debe ser mayor a 0';
+    END IF;
+
+    SELECT * INTO v_notif FROM notificaciones_servicios WHERE id = p_id_notif FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE SQLSTATE 'PT404' USING MESSAGE = 'Notificación no encontrada';
+    END IF;
+    IF v_notif.id_usuario IS DISTINCT FROM p_id_usuario THEN
+        RAISE SQLSTATE 'PT403' USING MESSAGE = CASE WHEN p_conservar_desc
+            THEN 'No autorizado para hacer contraoferta' ELSE 'No autorizado' END;
+    END IF;
+
+    SELECT nombre INTO v_nombre FROM "Usuario" WHERE id_usuario = p_id_usuario;
+    v_nombre := COALESCE(v_nombre, 'Usuario');
+
+    IF p_tipo = 'aceptado' THEN
+        v_titulo := format('%s aceptó tu oferta', v_nombre);
+        v_descripcion := format('Tu oferta para ''%s'' fue aceptada. Precio: $%s', v_notif.titulo, v_notif.precio);
+    ELSIF p_tipo = 'rechazado' THEN
+        v_titulo := format('%s rechazó tu oferta', v_nombre);
+        v_descripcion := format('Tu oferta para ''%s'' fue rechazada.', v_notif.titulo);
+    ELSE
+        v_titulo := format('%s hizo una contraoferta', v_nombre);
+        v_descripcion := CASE WHEN p_conservar_desc
+            THEN COALESCE(v_notif."desc", '')
+            ELSE format('Nueva propuesta para ''%s''', v_notif.titulo)
+        END;
+    END IF;
+
+    INSERT INTO notificaciones_pedidos_respuestas
+        (id_usuario_origen, id_usuario_destino, tipo, titulo, descripcion, precio_anterior, precio_nuevo, comentario, visto)
+    VALUES
+        (p_id_usuario, v_notif.id_usuario_origen, p_tipo, v_titulo, v_descripcion, v_notif.precio,
+         CASE WHEN p_tipo = 'contraoferta' THEN p_precio_nuevo END,
+         CASE WHEN p_tipo = 'contraoferta' THEN p_comentario END,
+         false)
+    RETURNING * INTO v_respuesta;
+
+    DELETE FROM notificaciones_servicios WHERE id = p_id_notif;
+
+    RETURN jsonb_build_object('respuesta', to_jsonb(v_respuesta), 'notificacion_eliminada', to_jsonb(v_notif));
+END;
+$$;
+
+-- Quien recibe una contraoferta la acepta (crea el Pedido con el precio nuevo),
+-- la rechaza, o contraoferta de vuelta. En todos los casos la original se borra.
+CREATE OR REPLACE FUNCTION responder_contraoferta(
+    p_id_respuesta BIGINT,
+    p_id_usuario BIGINT,
+    p_accion TEXT,
+    p_precio_nuevo FLOAT8 DEFAULT NULL,
+    p_comentario TEXT DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_original notificaciones_pedidos_respuestas;
+    v_nombre TEXT;
+    v_respuesta notificaciones_pedidos_respuestas;
+    v_pedido "Pedido";
+BEGIN
+    IF p_accion NOT IN ('aceptar', 'rechazar', 'contraoferta') THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = 'Acción inválida';
+    END IF;
+
+    SELECT * INTO v_original FROM notificaciones_pedidos_respuestas WHERE id = p_id_respuesta FOR UPDATE;
+    IF NOT FOUND THEN
+        RAISE SQLSTATE 'PT404' USING MESSAGE = 'Notificación no encontrada';
+    END IF;
+    IF v_original.tipo <> 'contraoferta' THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = CASE WHEN p_accion = 'contraoferta'
+            THEN 'Solo se puede hacer contraoferta a una contraoferta'
+            ELSE 'Esta notificación no es una contraoferta' END;
+    END IF;
+    IF v_original.id_usuario_destino IS DISTINCT FROM p_id_usuario THEN
+        RAISE SQLSTATE 'PT403' USING MESSAGE = 'No autorizado';
+    END IF;
+    IF p_accion = 'contraoferta' AND (p_precio_nuevo IS NULL OR p_precio_nuevo <= 0) THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = 'Precio debe ser mayor a 0';
+    END IF;
+
+    SELECT nombre INTO v_nombre FROM "Usuario" WHERE id_usuario = p_id_usuario;
+    v_nombre := COALESCE(v_nombre, 'Usuario');
+
+    IF p_accion = 'aceptar' THEN
+        -- Quien acepta es el demandante; quien hizo la contraoferta es el proveedor
+        INSERT INTO "Pedido" (titulo, descripcion, precio, id_categoria, id_usuario, accepted_by, accepted_at, status)
+        VALUES (COALESCE(v_original.descripcion, 'Pedido'), COALESCE(v_original.comentario, ''), v_original.precio_nuevo,
+                1, p_id_usuario, v_original.id_usuario_origen, now(), 'en_proceso')
+        RETURNING * INTO v_pedido;
+
+        INSERT INTO notificaciones_pedidos_respuestas
+            (id_usuario_origen, id_usuario_destino, tipo, titulo, descripcion, precio_anterior, precio_nuevo, visto)
+        VALUES
+            (p_id_usuario, v_original.id_usuario_origen, 'aceptado',
+             format('%s aceptó tu contraoferta', v_nombre),
+             format('Tu contraoferta de $%s fue aceptada. Pedido creado.', v_original.precio_nuevo),
+             v_original.precio_anterior, v_original.precio_nuevo, false)
+        RETURNING * INTO v_respuesta;
+    ELSIF p_accion = 'rechazar' THEN
+        INSERT INTO notificaciones_pedidos_respuestas
+            (id_usuario_origen, id_usuario_destino, tipo, titulo, descripcion, precio_anterior, precio_nuevo, visto)
+        VALUES
+            (p_id_usuario, v_original.id_usuario_origen, 'rechazado',
+             format('%s rechazó tu contraoferta', v_nombre),
+             format('Tu contraoferta de $%s fue rechazada.', v_original.precio_nuevo),
+             v_original.precio_anterior, v_original.precio_nuevo, false)
+        RETURNING * INTO v_respuesta;
+    ELSE
+        -- Contraoferta en cadena: el destino actual pasa a ser el origen
+        INSERT INTO notificaciones_pedidos_respuestas
+            (id_usuario_origen, id_usuario_destino, tipo, titulo, descripcion, precio_anterior, precio_nuevo, comentario, visto)
+        VALUES
+            (p_id_usuario, v_original.id_usuario_origen, 'contraoferta',
+             format('%s hizo una contraoferta', v_nombre),
+             COALESCE(v_original.descripcion, ''), v_original.precio_nuevo, p_precio_nuevo, p_comentario, false)
+        RETURNING * INTO v_respuesta;
+    END IF;
+
+    DELETE FROM notificaciones_pedidos_respuestas WHERE id = p_id_respuesta;
+
+    RETURN jsonb_build_object(
+        'pedido', to_jsonb(v_pedido),
+        'respuesta', to_jsonb(v_respuesta),
+        'respuesta_eliminada', to_jsonb(v_original)
+    );
+END;
+$$;
@@ -0,0 +1,31 @@
+-- Transiciones de estado de Pedido (pendiente -> en_proceso -> completado).
+-- El backend las hace con un UPDATE condicionado al estado esperado; acá se
+-- registra cuándo pasó cada una, sin depender de quién hizo el update.
+ALTER TABLE "Pedido" ADD COLUMN IF NOT EXISTS completado_at TIMESTAMPTZ;
+
+CREATE OR REPLACE FUNCTION pedido_transicion_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.status = 'en_proceso' AND OLD.status = 'pendiente' AND NEW.accepted_at IS NULL THEN
+        NEW.accepted_at := now();
+    END IF;
+    IF NEW.status = 'completado' AND OLD.status IS DISTINCT FROM 'completado' THEN
+        NEW.completado_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS pedido_transicion ON "Pedido";
+CREATE TRIGGER pedido_transicion
+BEFORE UPDATE OF status ON "Pedido"
+FOR EACH ROW EXECUTE FUNCTION pedido_transicion_trigger();
+
+-- Los completados previos toman su última modificación como fecha aproximada
+UPDATE "Pedido" SET completado_at = modificado_at
+WHERE status = 'completado' AND completado_at IS NULL;
+
+-- GET /pedidos?status= filtra por estado y pagina por id
+CREATE INDEX IF NOT EXISTS idx_pedido_status ON "Pedido" (status, id_pedidos DESC);
@@ -0,0 +1,54 @@
+-- Alta de usuario en un solo round trip.
+-- Hasta ahora el backend calculaba id_ubicacion como max + 1 y lo insertaba a
+-- mano, así que la secuencia del BIGSERIAL quedó atrasada: se la lleva al
+-- máximo actual antes de volver a usarla.
+SELECT setval(
+    pg_get_serial_sequence('"Ubicacion"', 'id_ubicacion'),
+    COALESCE((SELECT MAX(id_ubicacion) FROM "Ubicacion"), 0) + 1,
+    false
+);
+
+-- Crea la Ubicacion (si vienen datos) y el Usuario en la misma transacción.
+-- p_ubicacion: {"provincia", "barrio_zona", "calle", "altura", "piso"}; los
+-- tipos se toman de la tabla con jsonb_populate_record.
+CREATE OR REPLACE FUNCTION registrar_usuario(
+    p_mail TEXT,
+    p_password TEXT,
+    p_nombre TEXT,
+    p_ubicacion JSONB DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_id_ubicacion BIGINT;
+    v_usuario "Usuario";
+    v_restriccion TEXT;
+BEGIN
+    IF EXISTS (SELECT 1 FROM "Usuario" WHERE mail = p_mail) THEN
+        RAISE SQLSTATE 'PT400' USING MESSAGE = 'Email already registered';
+    END IF;
+
+    IF p_ubicacion IS NOT NULL AND p_ubicacion <> '{}'::jsonb THEN
+        INSERT INTO "Ubicacion" (provincia, barrio_zona, calle, altura, piso)
+        SELECT u.provincia, u.barrio_zona, u.calle, u.altura, u.piso
+        FROM jsonb_populate_record(NULL::"Ubicacion", p_ubicacion) u
+        RETURNING id_ubicacion INTO v_id_ubicacion;
+    END IF;
+
+    INSERT INTO "Usuario" (mail, password, nombre, id_ubicacion)
+    VALUES (p_mail, p_password, COALESCE(p_nombre, 'Usuario'), v_id_ubicacion)
+    RETURNING * INTO v_usuario;
+
+    RETURN to_jsonb(v_usuario);
+EXCEPTION
+    -- Dos registros simultáneos con el mismo mail: el segundo choca con el UNIQUE
+    -- de mail (Usuario_mail_key). Cualquier otra violación no es un mail repetido.
+    WHEN unique_violation THEN
+        GET STACKED DIAGNOSTICS v_restriccion = CONSTRAINT_NAME;
+        IF v_restriccion = 'Usuario_mail_key' THEN
+            RAISE SQLSTATE 'PT400' USING MESSAGE = 'Email already registered';
+        END IF;
+        RAISE;
+END;
+$$;
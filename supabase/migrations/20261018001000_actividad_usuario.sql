@@ -0,0 +1,147 @@
+-- Resumen de actividad por usuario, mantenido por triggers sobre Pedido y Servicio.
+-- Los widgets de perfil y de "mis actividades" contaban servicios y pedidos
+-- bajándose las tablas enteras; con esto son una lectura por clave primaria.
+-- pedidos_*: pedidos que el usuario creó, por estado. aceptados_*: pedidos que
+-- aceptó como proveedor. ganado / gastado: suma de precio de los completados.
+CREATE TABLE IF NOT EXISTS actividad_usuario (
+    id_usuario BIGINT PRIMARY KEY,
+    pedidos_pendiente INTEGER NOT NULL DEFAULT 0,
+    pedidos_en_proceso INTEGER NOT NULL DEFAULT 0,
+    pedidos_completado INTEGER NOT NULL DEFAULT 0,
+    aceptados_en_proceso INTEGER NOT NULL DEFAULT 0,
+    aceptados_completado INTEGER NOT NULL DEFAULT 0,
+    gastado FLOAT8 NOT NULL DEFAULT 0,
+    ganado FLOAT8 NOT NULL DEFAULT 0,
+    servicios_activos INTEGER NOT NULL DEFAULT 0,
+    servicios_total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION ajustar_actividad(p_id_usuario BIGINT, p_columna TEXT, p_delta FLOAT8)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_id_usuario IS NULL OR p_delta = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO actividad_usuario (id_usuario) VALUES (p_id_usuario)
+    ON CONFLICT (id_usuario) DO NOTHING;
+    EXECUTE format(
+        'UPDATE actividad_usuario SET %1$I = GREATEST(%1$I + $1, 0) WHERE id_usuario = $2',
+        p_columna
+    ) USING p_delta, p_id_usuario;
+END;
+$$;
+
+-- Suma (p_signo = 1) o resta (-1) lo que aporta una fila de Pedido
+CREATE OR REPLACE FUNCTION aportar_pedido(p_pedido "Pedido", p_signo INTEGER)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_pedido.status NOT IN ('pendiente', 'en_proceso', 'completado') THEN
+        RETURN;
+    END IF;
+    PERFORM ajustar_actividad(p_pedido.id_usuario, 'pedidos_' || p_pedido.status, p_signo);
+    IF p_pedido.status <> 'pendiente' THEN
+        PERFORM ajustar_actividad(p_pedido.accepted_by, 'aceptados_' || p_pedido.status, p_signo);
+    END IF;
+    IF p_pedido.status = 'completado' THEN
+        PERFORM ajustar_actividad(p_pedido.id_usuario, 'gastado', p_signo * COALESCE(p_pedido.precio, 0));
+        PERFORM ajustar_actividad(p_pedido.accepted_by, 'ganado', p_signo * COALESCE(p_pedido.precio, 0));
+    END IF;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION pedido_actividad_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM aportar_pedido(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM aportar_pedido(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS pedido_actividad ON "Pedido";
+CREATE TRIGGER pedido_actividad
+AFTER INSERT OR DELETE OR UPDATE OF status, id_usuario, accepted_by, precio ON "Pedido"
+FOR EACH ROW EXECUTE FUNCTION pedido_actividad_trigger();
+
+CREATE OR REPLACE FUNCTION servicio_actividad_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM ajustar_actividad(OLD.id_usuario, 'servicios_total', -1);
+        IF COALESCE(OLD.activo, true) THEN
+            PERFORM ajustar_actividad(OLD.id_usuario, 'servicios_activos', -1);
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM ajustar_actividad(NEW.id_usuario, 'servicios_total', 1);
+        IF COALESCE(NEW.activo, true) THEN
+            PERFORM ajustar_actividad(NEW.id_usuario, 'servicios_activos', 1);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS servicio_actividad ON "Servicio";
+CREATE TRIGGER servicio_actividad
+AFTER INSERT OR DELETE OR UPDATE OF activo, id_usuario ON "Servicio"
+FOR EACH ROW EXECUTE FUNCTION servicio_actividad_trigger();
+
+-- Cargar los valores actuales
+INSERT INTO actividad_usuario (
+    id_usuario, pedidos_pendiente, pedidos_en_proceso, pedidos_completado,
+    aceptados_en_proceso, aceptados_completado, gastado, ganado,
+    servicios_activos, servicios_total
+)
+SELECT id_usuario, SUM(pp), SUM(pe), SUM(pc), SUM(ae), SUM(ac), SUM(gastado), SUM(ganado), SUM(sa), SUM(st)
+FROM (
+    SELECT id_usuario,
+        COUNT(*) FILTER (WHERE status = 'pendiente') AS pp,
+        COUNT(*) FILTER (WHERE status = 'en_proceso') AS pe,
+        COUNT(*) FILTER (WHERE status = 'completado') AS pc,
+        0 AS ae, 0 AS ac,
+        COALESCE(SUM(precio) FILTER (WHERE status = 'completado'), 0) AS gastado,
+        0 AS ganado, 0 AS sa, 0 AS st
+    FROM "Pedido" GROUP BY id_usuario
+    UNION ALL
+    SELECT accepted_by, 0, 0, 0,
+        COUNT(*) FILTER (WHERE status = 'en_proceso'),
+        COUNT(*) FILTER (WHERE status = 'completado'),
+        0,
+        COALESCE(SUM(precio) FILTER (WHERE status = 'completado'), 0),
+        0, 0
+    FROM "Pedido" WHERE accepted_by IS NOT NULL GROUP BY accepted_by
+    UNION ALL
+    SELECT id_usuario, 0, 0, 0, 0, 0, 0, 0,
+        COUNT(*) FILTER (WHERE COALESCE(activo, true)),
+        COUNT(*)
+    FROM "Servicio" GROUP BY id_usuario
+) t
+WHERE id_usuario IS NOT NULL
+GROUP BY id_usuario
+ON CONFLICT (id_usuario) DO UPDATE SET
+    pedidos_pendiente = EXCLUDED.pedidos_pendiente,
+    pedidos_en_proceso = EXCLUDED.pedidos_en_proceso,
+    pedidos_completado = EXCLUDED.pedidos_completado,
+    aceptados_en_proceso = EXCLUDED.aceptados_en_proceso,
+    aceptados_completado = EXCLUDED.aceptados_completado,
+    gastado = EXCLUDED.gastado,
+    ganado = EXCLUDED.ganado,
+    servicios_activos = EXCLUDED.servicios_activos,
+    servicios_total = EXCLUDED.servicios_total;
+
+-- /users/me/pedidos?exclude_status= y ?status=a,b filtran por estado dentro de cada scope
+CREATE INDEX IF NOT EXISTS idx_pedido_owner_status ON "Pedido" (id_usuario, status, id_pedidos DESC);
+CREATE INDEX IF NOT EXISTS idx_pedido_accepted_status ON "Pedido" (accepted_by, status, id_pedidos DESC);
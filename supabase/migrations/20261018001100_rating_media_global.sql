@@ -0,0 +1,10 @@
+-- Media global de ratings para el prior bayesiano de /profesionales-destacados.
+-- Se calcula en la base sobre rating_resumen (una fila por usuario calificado)
+-- para que el backend no tenga que bajarse la tabla entera para sacar un número.
+CREATE OR REPLACE FUNCTION rating_media_global()
+RETURNS FLOAT8
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(SUM(suma)::float8 / NULLIF(SUM(cantidad), 0), 0) FROM rating_resumen
+$$;
@@ -0,0 +1,31 @@
+-- Tickets de un solo uso para abrir GET /eventos.
+-- EventSource no puede mandar headers y el JWT en la query string termina en
+-- los logs de proxies y del servidor. El cliente pide un ticket con
+-- POST /eventos/ticket (autenticado) y lo canjea al conectarse. Se guarda el
+-- sha256 del ticket, no el ticket.
+CREATE TABLE IF NOT EXISTS tickets_eventos (
+    hash TEXT PRIMARY KEY,
+    id_usuario BIGINT NOT NULL,
+    vence TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tickets_eventos_vence ON tickets_eventos (vence);
+
+-- Devuelve el id_usuario del ticket y lo borra; NULL si no existe o venció.
+-- De paso limpia los vencidos, así la tabla no crece.
+CREATE OR REPLACE FUNCTION canjear_ticket_eventos(p_hash TEXT)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_id_usuario BIGINT;
+BEGIN
+    DELETE FROM tickets_eventos
+    WHERE hash = p_hash AND vence > now()
+    RETURNING id_usuario INTO v_id_usuario;
+
+    DELETE FROM tickets_eventos WHERE vence <= now();
+
+    RETURN v_id_usuario;
+END;
+$$;
@@ -0,0 +1,125 @@
+-- Bandeja paginada sobre columnas indexadas.
+-- La vista ordenaba y comparaba por `clave`, un texto calculado que ningún
+-- índice puede servir: cada página armaba y ordenaba todas las notificaciones
+-- del usuario. Ahora cada tabla se recorre por su índice (usuario, created_at, id)
+-- desde el cursor, se toman a lo sumo p_limit filas de cada una y se mezclan.
+CREATE INDEX IF NOT EXISTS idx_notif_servicios_inbox_keyset ON notificaciones_servicios (id_usuario, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notif_pedidos_inbox_keyset ON notificaciones_pedidos (id_usuario, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notif_respuestas_inbox_keyset ON notificaciones_pedidos_respuestas (id_usuario_destino, created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_notif_servicios_inbox;
+DROP INDEX IF EXISTS idx_notif_pedidos_inbox;
+DROP INDEX IF EXISTS idx_notif_respuestas_inbox;
+
+-- La vista queda para contar (X-Total-Count); ya no lleva `clave`
+DROP VIEW IF EXISTS notificaciones_inbox;
+CREATE VIEW notificaciones_inbox AS
+SELECT
+    'servicio'::text AS origen,
+    id::bigint AS id,
+    id_usuario::bigint AS id_usuario,
+    id_usuario_origen::bigint AS id_usuario_origen,
+    'solicitud'::text AS tipo,
+    titulo::text AS titulo,
+    "desc"::text AS descripcion,
+    precio::float8 AS precio,
+    NULL::float8 AS precio_nuevo,
+    (accepted_by IS NOT NULL) AS visto,
+    created_at
+FROM notificaciones_servicios
+UNION ALL
+SELECT
+    'pedido'::text,
+    id::bigint,
+    id_usuario::bigint,
+    accepted_by::bigint,
+    'pedido_aceptado'::text,
+    titulo::text,
+    "desc"::text,
+    precio::float8,
+    NULL::float8,
+    visto,
+    created_at
+FROM notificaciones_pedidos
+UNION ALL
+SELECT
+    'respuesta'::text,
+    id::bigint,
+    id_usuario_destino::bigint,
+    id_usuario_origen::bigint,
+    tipo::text,
+    titulo::text,
+    descripcion::text,
+    precio_anterior::float8,
+    precio_nuevo::float8,
+    COALESCE(visto, false),
+    created_at
+FROM notificaciones_pedidos_respuestas;
+
+-- Orden total: created_at DESC, origen (respuesta > pedido > servicio), id DESC.
+-- El cursor es la última fila devuelta (p_fecha, p_origen, p_id); sin cursor,
+-- desde la más nueva. p_limit NULL es sin límite.
+-- Los filtros comparan las columnas sin castear para que usen los índices.
+CREATE OR REPLACE FUNCTION notificaciones_inbox_pagina(
+    p_id_usuario BIGINT,
+    p_solo_no_leidas BOOLEAN DEFAULT false,
+    p_fecha TIMESTAMPTZ DEFAULT NULL,
+    p_origen TEXT DEFAULT NULL,
+    p_id BIGINT DEFAULT NULL,
+    p_limit INTEGER DEFAULT NULL
+)
+RETURNS SETOF notificaciones_inbox
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_hasta TIMESTAMPTZ := COALESCE(p_fecha, 'infinity');
+    v_orden INTEGER := COALESCE(array_position(ARRAY['servicio', 'pedido', 'respuesta'], p_origen), 0);
+BEGIN
+    RETURN QUERY
+    SELECT t.origen, t.id, t.id_usuario, t.id_usuario_origen, t.tipo, t.titulo,
+        t.descripcion, t.precio, t.precio_nuevo, t.visto, t.created_at
+    FROM (
+        (
+            SELECT 'servicio'::text AS origen, 1 AS orden, n.id::bigint AS id, n.id_usuario::bigint AS id_usuario,
+                n.id_usuario_origen::bigint AS id_usuario_origen, 'solicitud'::text AS tipo, n.titulo::text AS titulo,
+                n."desc"::text AS descripcion, n.precio::float8 AS precio, NULL::float8 AS precio_nuevo,
+                (n.accepted_by IS NOT NULL) AS visto, n.created_at
+            FROM notificaciones_servicios n
+            WHERE n.id_usuario = p_id_usuario
+              AND n.created_at <= v_hasta
+              AND (p_fecha IS NULL OR n.created_at < p_fecha OR 1 < v_orden OR (1 = v_orden AND n.id < p_id))
+              AND (NOT p_solo_no_leidas OR n.accepted_by IS NULL)
+            ORDER BY n.created_at DESC, n.id DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT 'pedido'::text, 2, n.id::bigint, n.id_usuario::bigint, n.accepted_by::bigint,
+                'pedido_aceptado'::text, n.titulo::text, n."desc"::text, n.precio::float8, NULL::float8,
+                n.visto, n.created_at
+            FROM notificaciones_pedidos n
+            WHERE n.id_usuario = p_id_usuario
+              AND n.created_at <= v_hasta
+              AND (p_fecha IS NULL OR n.created_at < p_fecha OR 2 < v_orden OR (2 = v_orden AND n.id < p_id))
+              AND (NOT p_solo_no_leidas OR NOT n.visto)
+            ORDER BY n.created_at DESC, n.id DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT 'respuesta'::text, 3, n.id::bigint, n.id_usuario_destino::bigint, n.id_usuario_origen::bigint,
+                n.tipo::text, n.titulo::text, n.descripcion::text, n.precio_anterior::float8, n.precio_nuevo::float8,
+                COALESCE(n.visto, false), n.created_at
+            FROM notificaciones_pedidos_respuestas n
+            WHERE n.id_usuario_destino = p_id_usuario
+              AND n.created_at <= v_hasta
+              AND (p_fecha IS NULL OR n.created_at < p_fecha OR 3 < v_orden OR (3 = v_orden AND n.id < p_id))
+              AND (NOT p_solo_no_leidas OR NOT COALESCE(n.visto, false))
+            ORDER BY n.created_at DESC, n.id DESC
+            LIMIT p_limit
+        )
+    ) t
+    ORDER BY t.created_at DESC, t.orden DESC, t.id DESC
+    LIMIT p_limit;
+END;
+$$;
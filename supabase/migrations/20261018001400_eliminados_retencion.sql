@@ -0,0 +1,5 @@
+-- Retención de lápidas de sincronización.
+-- El backend borra cada tanto las filas de `eliminados` más viejas que
+-- SINCRONIZACION_RETENCION_DIAS (DELETE ... WHERE eliminado_at < límite);
+-- este índice evita recorrer la tabla entera en cada purga.
+CREATE INDEX IF NOT EXISTS idx_eliminados_fecha ON eliminados (eliminado_at);
@@ -0,0 +1,40 @@
+-- Ranking de /profesionales-destacados calculado en la base.
+-- Antes el backend tomaba los N usuarios con más ratings y recién ahí filtraba
+-- por categoría y zona: una categoría o zona chica podía quedar vacía, y alguien
+-- con pocos ratings pero mejor score nunca competía. Acá el score bayesiano
+-- (p_peso * media + suma) / (p_peso + cantidad) se calcula sobre todo
+-- rating_resumen, se filtra y después se corta en p_limite.
+-- p_media NULL usa rating_media_global(). p_zona llega en minúsculas y se
+-- compara contra provincia o barrio_zona.
+CREATE OR REPLACE FUNCTION profesionales_destacados(
+    p_limite INTEGER,
+    p_peso FLOAT8,
+    p_media FLOAT8 DEFAULT NULL,
+    p_id_categoria BIGINT DEFAULT NULL,
+    p_zona TEXT DEFAULT NULL
+)
+RETURNS TABLE (id_usuario BIGINT, cantidad INTEGER, suma INTEGER, score FLOAT8)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH prior AS (
+        SELECT COALESCE(p_media, rating_media_global()) AS media
+    )
+    SELECT r.id_usuario, r.cantidad, r.suma,
+        (p_peso * prior.media + r.suma) / (p_peso + r.cantidad) AS score
+    FROM rating_resumen r
+    CROSS JOIN prior
+    JOIN "Usuario" u ON u.id_usuario = r.id_usuario
+    LEFT JOIN "Ubicacion" ub ON ub.id_ubicacion = u.id_ubicacion
+    WHERE r.cantidad > 0
+      AND (p_id_categoria IS NULL OR EXISTS (
+          SELECT 1 FROM "Servicio" s
+          WHERE s.id_usuario = r.id_usuario AND s.id_categoria = p_id_categoria
+      ))
+      AND (p_zona IS NULL OR lower(btrim(ub.provincia)) = p_zona OR lower(btrim(ub.barrio_zona)) = p_zona)
+    ORDER BY score DESC, r.cantidad DESC, r.id_usuario
+    LIMIT p_limite
+$$;
+
+-- El filtro por categoría busca los servicios de cada candidato
+CREATE INDEX IF NOT EXISTS idx_servicio_usuario_categoria ON "Servicio" (id_usuario, id_categoria);